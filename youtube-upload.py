@@ -8,92 +8,51 @@
 # Validates configuration file paths and exits with meaningful errors if invalid.
 # @version 1.3.3, 2025-09-26
 
+import argparse
 import configparser
+import contextlib
+import functools
+import hashlib
 import http.client
 import httplib2
+import google_auth_httplib2
 import json
+import mimetypes
+import mmap
 import os
 import random
+import stat
 import sys
+import tempfile
 import time
 import logging
+import logging.handlers
 import threading
 import queue
 import smtplib
+from concurrent.futures import ThreadPoolExecutor
+import email.utils
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta, timezone
 
-from googleapiclient.discovery import build  # Build API client
 from googleapiclient.errors import HttpError  # Handle API errors
-from googleapiclient.http import MediaFileUpload  # Handle file uploads
-from google_auth_oauthlib.flow import InstalledAppFlow  # OAuth flow for authentication
-from google.auth.exceptions import RefreshError  # Handle token refresh errors
-from google.auth.transport.requests import Request  # HTTP request for token refresh
-from google.oauth2.credentials import Credentials  # Manage OAuth credentials
+from googleapiclient.http import MediaFileUpload, MediaUpload, build_http  # Handle file uploads
+from google.auth.exceptions import RefreshError, TransportError  # Handle token refresh errors
 import urllib.error  # Handle URL-related errors
 
-# Load configuration from config.cfg
-config_file_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'config.cfg')  # Path to config file
 try:
-    config = configparser.ConfigParser()  # Initialize config parser
-    config.read(config_file_path)  # Read config file
-    if not config.sections():  # Check if config file is empty or invalid
-        raise configparser.Error("Config file is empty or malformed")
-except (configparser.Error, OSError, PermissionError) as e:
-    print(f"Error: Failed to read configuration file '{config_file_path}': {e}")
-    sys.exit(1)  # Exit with non-zero status code
-
-# Authentication settings
-try:
-    CLIENT_SECRETS_FILE = os.path.abspath(config.get('authentication', 'client_secrets_file'))  # Path to client_secrets.json
-    OAUTH2_STORAGE_FILE = os.path.abspath(config.get('authentication', 'oauth2_storage_file', fallback='/opt/Python Scripts/youtube-upload/youtube_oauth2_store.json'))  # Path to token storage
-    FORCE_TOKEN_REFRESH_DAYS = config.getint('authentication', 'force_token_refresh_days', fallback=7)  # Days before forcing token refresh
-    REFRESH_TIMEOUT = config.getint('authentication', 'refresh_timeout', fallback=30)  # Timeout for token refresh attempts
-except configparser.NoSectionError as e:
-    print(f"Error: Missing [authentication] section in config file: {e}")
-    sys.exit(1)
-except configparser.NoOptionError as e:
-    print(f"Error: Missing required option in [authentication] section: {e}")
-    sys.exit(1)
-
-# Upload settings
-try:
-    MAX_RETRIES = config.getint('upload_settings', 'MAX_RETRIES', fallback=3)  # Max retries for uploads and token refresh
-except configparser.NoSectionError as e:
-    print(f"Error: Missing [upload_settings] section in config file: {e}")
-    sys.exit(1)
+    import orjson  # Optional C-accelerated JSON for the token file
+except ImportError:
+    orjson = None
 
-# Logging settings
 try:
-    LOG_FILE = config.get('logging', 'log_file', fallback='/opt/Python Scripts/youtube-upload/youtube_upload.log')  # Path to log file
-    LOG_LEVEL = config.get('logging', 'log_level', fallback='INFO').upper()  # Log level (e.g., INFO, DEBUG)
-except configparser.NoSectionError as e:
-    print(f"Error: Missing [logging] section in config file: {e}")
-    sys.exit(1)
+    import fcntl  # POSIX file locking for the token file
+except ImportError:  # Not available on Windows, token writes are then unlocked
+    fcntl = None
 
-# Mail settings
-try:
-    MAIL_ENABLED = config.getboolean('mail', 'enabled', fallback=False)  # Enable/disable email notifications
-    SMTP_SERVER = config.get('mail', 'smtp_server', fallback='smtp.gmail.com')  # SMTP server address
-    SMTP_PORT = config.getint('mail', 'smtp_port', fallback=587)  # SMTP server port
-    USE_TLS = config.getboolean('mail', 'use_tls', fallback=True)  # Enable TLS encryption
-    SMTP_USERNAME = config.get('mail', 'smtp_username', fallback='')  # SMTP username
-    SMTP_PASSWORD = config.get('mail', 'smtp_password', fallback='')  # SMTP password
-    FROM_EMAIL = config.get('mail', 'from_email', fallback='')  # Sender email address
-    TO_EMAIL = config.get('mail', 'to_email', fallback='')  # Recipient email address
-    SUBJECT_PREFIX = config.get('mail', 'subject_prefix', fallback='[YouTube Upload]')  # Email subject prefix
-except configparser.NoSectionError:
-    # Mail section is optional, use defaults
-    MAIL_ENABLED = False
-    SMTP_SERVER = 'smtp.gmail.com'
-    SMTP_PORT = 587
-    USE_TLS = True
-    SMTP_USERNAME = ''
-    SMTP_PASSWORD = ''
-    FROM_EMAIL = ''
-    TO_EMAIL = ''
-    SUBJECT_PREFIX = '[YouTube Upload]'
+# Path to config file, read by load_config() once the command line has been parsed
+config_file_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'config.cfg')
 
 # Map string log levels to logging module constants
 LOG_LEVELS = {
@@ -104,19 +63,8 @@ LOG_LEVELS = {
     'CRITICAL': logging.CRITICAL
 }
 
-# Configure logging
-try:
-    logging.basicConfig(
-        level=LOG_LEVELS.get(LOG_LEVEL, logging.INFO),  # Set log level
-        format='%(asctime)s - %(levelname)s - %(message)s',  # Log format
-        handlers=[
-            logging.FileHandler(LOG_FILE),  # Log to file
-            logging.StreamHandler()  # Log to console
-        ]
-    )
-except (OSError, PermissionError) as e:
-    print(f"Error: Cannot configure logging to '{LOG_FILE}': {e}")
-    sys.exit(1)  # Exit with non-zero status code
+LOG_BUFFER_RECORDS = 256  # Log lines held in memory before they are written to the log file
+
 logger = logging.getLogger(__name__)  # Initialize logger
 
 def send_email(subject, body, to_email_override=None):
@@ -162,23 +110,80 @@ def send_email(subject, body, to_email_override=None):
     except Exception as e:
         logger.error(f"Unexpected error sending email: {e}")
 
+CHUNK_ALIGNMENT = 256 * 1024  # Resumable upload chunks must be a multiple of 256 KiB
+SIMPLE_UPLOAD_MAX_SIZE = 5 * 1024 * 1024  # Videos up to this size are sent in a single request, as Google recommends
+MAX_VIDEO_FILE_SIZE = 256 * 1024 ** 3  # YouTube rejects videos larger than 256 GB
+READ_BUFFER_SIZE = 1 << 20  # Buffer for files that cannot be memory-mapped, so each chunk takes few read() calls
+POST_UPLOAD_WORKERS = 4  # Threads for the email, thumbnail and playlist calls that follow each upload
+
 # HTTP settings
 httplib2.RETRIES = 1  # Set HTTP retries to 1
-RETRIABLE_STATUS_CODES = [500, 502, 503, 504]  # HTTP status codes to retry
+RETRIABLE_STATUS_CODES = [500, 502, 503, 504, 529]  # Transient server errors to retry (incl. overloaded)
+RATE_LIMIT_STATUS_CODES = [429]  # Rate limited; retried on a separate budget of MAX_RETRIES, honoring Retry-After
+
+
+class IncompleteResponseError(Exception):
+    """The upload session finished with a response that carries no video id."""
+
+
 RETRIABLE_EXCEPTIONS = (
+    IncompleteResponseError,
     httplib2.HttpLib2Error, IOError, http.client.NotConnected,
     http.client.IncompleteRead, http.client.ImproperConnectionState,
     http.client.CannotSendRequest, http.client.CannotSendHeader,
     http.client.ResponseNotReady, http.client.BadStatusLine
 )  # Exceptions to retry
 
+HTTP_POOL_SIZE = 50  # Max keep-alive connections kept per host
+
+# Shared HTTP transports, created on first use so TCP/TLS connections are reused
+_refresh_session = None
+_thread_local = threading.local()  # Holds one API transport per thread
+
+def get_refresh_session():
+    """Return the pooled requests session used for OAuth token refreshes."""
+    global _refresh_session
+    if _refresh_session is None:
+        import requests  # requests is only needed once a token is refreshed
+        from requests.adapters import HTTPAdapter  # Connection pool for token refresh requests
+        _refresh_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)  # Retries are handled by refresh_token_with_retry
+        _refresh_session.mount("https://", adapter)
+    return _refresh_session
+
+def get_refresh_request():
+    """Return a google-auth transport over the pooled session that applies the configured refresh_timeout."""
+    from google.auth.transport.requests import Request  # HTTP request for token refresh
+    return functools.partial(Request(session=get_refresh_session()), timeout=REFRESH_TIMEOUT)
+
+def get_api_http(creds):
+    """
+    Return this thread's authorized keep-alive transport for YouTube API calls.
+    httplib2 is not thread-safe, so each thread gets its own connection, built like googleapiclient's
+    default transport so that resumable uploads work from every thread.
+    """
+    api_http = getattr(_thread_local, 'api_http', None)
+    if api_http is None or api_http.credentials is not creds:
+        if api_http is not None:
+            api_http.http.close()  # Transport for replaced credentials, do not leave its connections open
+        http = build_http()  # Keeps 308 "Resume Incomplete" from being followed as a redirect
+        http.timeout = HTTP_TIMEOUT or None  # Socket timeout, 0 = none
+        api_http = google_auth_httplib2.AuthorizedHttp(creds, http=http)
+        _thread_local.api_http = api_http
+    return api_http
+
+def execute_request(request):
+    """Execute an API request over the calling thread's transport."""
+    return request.execute(http=get_api_http(request.http.credentials))
+
 # OAuth 2.0 and API settings
 SCOPES = ["https://www.googleapis.com/auth/youtube.upload", "https://www.googleapis.com/auth/youtube"]  # OAuth scopes
 YOUTUBE_API_SERVICE_NAME = "youtube"  # YouTube API service name
 YOUTUBE_API_VERSION = "v3"  # YouTube API version
+TOKEN_STALE_SECONDS = 300  # Refresh in the background once less than this remains (ahead of google-auth's own ~4 min threshold)
 
 # Error message for missing client_secrets.json
-MISSING_CLIENT_SECRETS_MESSAGE = """
+MISSING_CLIENT_SECRETS_TEMPLATE = """
 WARNING: Please configure OAuth 2.0
 
 To make this sample run you will need to populate the client_secrets.json file
@@ -191,50 +196,212 @@ https://console.cloud.google.com/
 
 For more information about the client_secrets.json file format, please visit:
 https://developers.google.com/api-client-library/python/guide/aaa_client_secrets
-""" % os.path.abspath(os.path.join(os.path.dirname(__file__), CLIENT_SECRETS_FILE))
+"""
+
+_config_cache = {}  # (path, mtime_ns) -> parsed ConfigParser
+
+def read_config(path):
+    """Parse the config file, reusing the previous parse while its modification time is unchanged."""
+    key = (path, os.stat(path).st_mtime_ns)  # Raises FileNotFoundError if the file is missing
+    config = _config_cache.get(key)
+    if config is None:
+        config = configparser.ConfigParser()  # Initialize config parser
+        with open(path) as f:
+            config.read_file(f)  # Read config file
+        _config_cache.clear()
+        _config_cache[key] = config
+    return config
+
+def load_config():
+    """
+    Read config.cfg into the module-level settings and configure logging.
+    Called after argument parsing so that --help works without a config file.
+    """
+    global CLIENT_SECRETS_FILE, OAUTH2_STORAGE_FILE, FORCE_TOKEN_REFRESH_DAYS, REFRESH_TIMEOUT, MAX_RETRIES, \
+        UPLOAD_CHUNK_SIZE, MAX_CONCURRENT_UPLOADS, HTTP_TIMEOUT, RETRY_BASE_DELAY, RETRY_MAX_DELAY, RETRY_DEADLINE_SECONDS, LOG_FILE, LOG_LEVEL, MAIL_ENABLED, \
+        SMTP_SERVER, SMTP_PORT, USE_TLS, SMTP_USERNAME, SMTP_PASSWORD, FROM_EMAIL, TO_EMAIL, SUBJECT_PREFIX
+
+    # Load configuration from config.cfg
+    try:
+        config = read_config(config_file_path)
+        if not config.sections():  # Check if config file is empty or invalid
+            raise configparser.Error("Config file is empty or malformed")
+    except (configparser.Error, OSError, PermissionError) as e:
+        print(f"Error: Failed to read configuration file '{config_file_path}': {e}")
+        sys.exit(1)  # Exit with non-zero status code
+
+    # Authentication settings
+    try:
+        CLIENT_SECRETS_FILE = os.path.abspath(config.get('authentication', 'client_secrets_file'))  # Path to client_secrets.json
+        OAUTH2_STORAGE_FILE = os.path.abspath(config.get('authentication', 'oauth2_storage_file', fallback='/opt/Python Scripts/youtube-upload/youtube_oauth2_store.json'))  # Path to token storage
+        FORCE_TOKEN_REFRESH_DAYS = config.getint('authentication', 'force_token_refresh_days', fallback=7)  # Days before forcing token refresh
+        REFRESH_TIMEOUT = config.getint('authentication', 'refresh_timeout', fallback=30)  # Timeout for token refresh attempts
+    except configparser.NoSectionError as e:
+        print(f"Error: Missing [authentication] section in config file: {e}")
+        sys.exit(1)
+    except configparser.NoOptionError as e:
+        print(f"Error: Missing required option in [authentication] section: {e}")
+        sys.exit(1)
+    except ValueError as e:  # e.g. force_token_refresh_days = seven
+        print(f"Error: Invalid value in [authentication] section: {e}")
+        sys.exit(1)
+
+    # Upload settings
+    try:
+        MAX_RETRIES = config.getint('upload_settings', 'MAX_RETRIES', fallback=3)  # Max retries for uploads and token refresh
+        UPLOAD_CHUNK_SIZE = config.getint('upload_settings', 'chunk_size', fallback=64 * 1024 * 1024)  # Bytes per resumable upload request
+        RETRY_BASE_DELAY = config.getfloat('upload_settings', 'retry_base_delay', fallback=1.0)  # Shortest retry delay in seconds
+        RETRY_MAX_DELAY = config.getfloat('upload_settings', 'retry_max_delay', fallback=30.0)  # Longest retry delay in seconds
+        RETRY_DEADLINE_SECONDS = config.getfloat('upload_settings', 'retry_deadline', fallback=900.0)  # Give up once retrying takes longer (0 = no limit)
+        MAX_CONCURRENT_UPLOADS = max(1, config.getint('upload_settings', 'max_concurrent_uploads', fallback=2))  # Parallel uploads in batch mode
+        HTTP_TIMEOUT = config.getfloat('upload_settings', 'http_timeout', fallback=120.0)  # Seconds a stalled API connection may stay silent
+    except configparser.NoSectionError as e:
+        print(f"Error: Missing [upload_settings] section in config file: {e}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: Invalid value in [upload_settings] section: {e}")
+        sys.exit(1)
+
+    # Logging settings
+    try:
+        LOG_FILE = config.get('logging', 'log_file', fallback='/opt/Python Scripts/youtube-upload/youtube_upload.log')  # Path to log file
+        LOG_LEVEL = config.get('logging', 'log_level', fallback='INFO').upper()  # Log level (e.g., INFO, DEBUG)
+    except configparser.NoSectionError as e:
+        print(f"Error: Missing [logging] section in config file: {e}")
+        sys.exit(1)
+
+    # Mail settings
+    try:
+        MAIL_ENABLED = config.getboolean('mail', 'enabled', fallback=False)  # Enable/disable email notifications
+        SMTP_SERVER = config.get('mail', 'smtp_server', fallback='smtp.gmail.com')  # SMTP server address
+        SMTP_PORT = config.getint('mail', 'smtp_port', fallback=587)  # SMTP server port
+        USE_TLS = config.getboolean('mail', 'use_tls', fallback=True)  # Enable TLS encryption
+        SMTP_USERNAME = config.get('mail', 'smtp_username', fallback='')  # SMTP username
+        SMTP_PASSWORD = config.get('mail', 'smtp_password', fallback='')  # SMTP password
+        FROM_EMAIL = config.get('mail', 'from_email', fallback='')  # Sender email address
+        TO_EMAIL = config.get('mail', 'to_email', fallback='')  # Recipient email address
+        SUBJECT_PREFIX = config.get('mail', 'subject_prefix', fallback='[YouTube Upload]')  # Email subject prefix
+    except configparser.NoSectionError:
+        # Mail section is optional, use defaults
+        MAIL_ENABLED = False
+        SMTP_SERVER = 'smtp.gmail.com'
+        SMTP_PORT = 587
+        USE_TLS = True
+        SMTP_USERNAME = ''
+        SMTP_PASSWORD = ''
+        FROM_EMAIL = ''
+        TO_EMAIL = ''
+        SUBJECT_PREFIX = '[YouTube Upload]'
+    except ValueError as e:
+        print(f"Error: Invalid value in [mail] section: {e}")
+        sys.exit(1)
+
+    # Resumable upload chunks must be a multiple of 256 KiB (except the last one)
+    UPLOAD_CHUNK_SIZE = max(CHUNK_ALIGNMENT, UPLOAD_CHUNK_SIZE - UPLOAD_CHUNK_SIZE % CHUNK_ALIGNMENT)  # Round down to alignment
+
+    # Configure logging
+    try:
+        log_format = '%(asctime)s - %(levelname)s - %(message)s'  # Log format
+        file_handler = logging.handlers.WatchedFileHandler(LOG_FILE)  # Reopens the file after logrotate moves it
+        file_handler.setFormatter(logging.Formatter(log_format))  # MemoryHandler passes records on unformatted
+        logging.basicConfig(
+            level=LOG_LEVELS.get(LOG_LEVEL, logging.INFO),  # Set log level
+            format=log_format,
+            handlers=[
+                logging.handlers.MemoryHandler(  # Log to file, written in batches instead of one write per line
+                    capacity=LOG_BUFFER_RECORDS,
+                    flushLevel=logging.ERROR,  # Errors are written out immediately, together with the lines before them
+                    target=file_handler
+                ),
+                logging.StreamHandler()  # Log to console
+            ]
+        )
+    except (OSError, PermissionError) as e:
+        print(f"Error: Cannot configure logging to '{LOG_FILE}': {e}")
+        sys.exit(1)  # Exit with non-zero status code
 
 def check_files():
     """Check if required files and directories exist and are accessible."""
-    # Validate client_secrets_file
-    if not os.path.exists(CLIENT_SECRETS_FILE):
-        logger.error(f"Client secrets file '{CLIENT_SECRETS_FILE}' does not exist.")
-        print(MISSING_CLIENT_SECRETS_MESSAGE)
+    # Validate client_secrets_file with a single stat() call
+    try:
+        secrets_mode = os.stat(CLIENT_SECRETS_FILE).st_mode
+    except FileNotFoundError:
+        logger.error("Client secrets file '%s' does not exist.", CLIENT_SECRETS_FILE)
+        print(MISSING_CLIENT_SECRETS_TEMPLATE % CLIENT_SECRETS_FILE)  # Only built when needed
+        sys.exit(1)  # Exit with non-zero status code
+    except OSError as e:
+        logger.error("Cannot access client secrets file '%s': %s", CLIENT_SECRETS_FILE, e)
         sys.exit(1)  # Exit with non-zero status code
-    if not os.path.isfile(CLIENT_SECRETS_FILE):
-        logger.error(f"Path '{CLIENT_SECRETS_FILE}' is not a valid file.")
+    if not stat.S_ISREG(secrets_mode):
+        logger.error("Path '%s' is not a valid file.", CLIENT_SECRETS_FILE)
         sys.exit(1)  # Exit with non-zero status code
 
-    # Validate oauth2_storage_file directory
+    # Validate oauth2_storage_file directory; access() fails for a missing directory too,
+    # so the existence check is only needed to pick the error message
     oauth2_dir = os.path.dirname(OAUTH2_STORAGE_FILE)
-    if not os.path.exists(oauth2_dir):
-        logger.error(f"Directory for OAuth storage file '{oauth2_dir}' does not exist.")
-        sys.exit(1)  # Exit with non-zero status code
     if not os.access(oauth2_dir, os.W_OK):
-        logger.error(f"Directory for OAuth storage file '{oauth2_dir}' is not writable.")
+        if not os.path.exists(oauth2_dir):
+            logger.error("Directory for OAuth storage file '%s' does not exist.", oauth2_dir)
+        else:
+            logger.error("Directory for OAuth storage file '%s' is not writable.", oauth2_dir)
         sys.exit(1)  # Exit with non-zero status code
 
     # Validate log_file directory
     log_dir = os.path.dirname(LOG_FILE)
-    if not os.path.exists(log_dir):
-        logger.error(f"Directory for log file '{log_dir}' does not exist.")
-        sys.exit(1)  # Exit with non-zero status code
     if not os.access(log_dir, os.W_OK):
-        logger.error(f"Directory for log file '{log_dir}' is not writable.")
+        if not os.path.exists(log_dir):
+            logger.error("Directory for log file '%s' does not exist.", log_dir)
+        else:
+            logger.error("Directory for log file '%s' is not writable.", log_dir)
         sys.exit(1)  # Exit with non-zero status code
 
+def find_unusable_inputs(videos):
+    """Return the video and thumbnail paths of all upload entries that cannot be stat()ed or are too large, as 'path (reason)' strings."""
+    unusable = []
+    for options in videos:
+        for path in (options.videofile, options.thumbnail):
+            if not path:
+                continue
+            try:
+                size = os.stat(path).st_size
+            except OSError as e:  # Missing, unreadable directory, ...
+                unusable.append(f"{path} ({e.strerror})")
+                continue
+            if path == options.videofile and size > MAX_VIDEO_FILE_SIZE:
+                unusable.append(f"{path} ({size} bytes, larger than YouTube's 256 GB limit)")
+    return unusable
+
+def json_loads(data):
+    """Decode JSON with orjson when available, falling back to the standard library."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps(obj):
+    """Encode JSON to bytes with orjson when available, falling back to the standard library."""
+    return orjson.dumps(obj) if orjson else json.dumps(obj, separators=(",", ":")).encode("utf-8")  # Compact, like orjson
+
 def load_tokens():
     """Load OAuth tokens from file or return None if not found."""
-    if os.path.exists(OAUTH2_STORAGE_FILE):  # Check if token file exists
-        try:
-            with open(OAUTH2_STORAGE_FILE, "r") as f:
-                logger.info(f"Loading tokens from {OAUTH2_STORAGE_FILE}")
-                return json.load(f)  # Read token JSON
-        except (OSError, json.JSONDecodeError) as e:
-            logger.error(f"Failed to load OAuth tokens from '{OAUTH2_STORAGE_FILE}': {e}")
-            os.remove(OAUTH2_STORAGE_FILE) if os.path.exists(OAUTH2_STORAGE_FILE) else None
-            return None
-    logger.warning(f"No token file found at {OAUTH2_STORAGE_FILE}, new authentication required.")
-    return None
+    try:
+        with open(OAUTH2_STORAGE_FILE, "rb") as f:  # Opening directly saves a separate existence check
+            logger.info("Loading tokens from %s", OAUTH2_STORAGE_FILE)
+            return json_loads(f.read())  # Read token JSON (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+    except FileNotFoundError:
+        logger.warning("No token file found at %s, new authentication required.", OAUTH2_STORAGE_FILE)
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error("Failed to load OAuth tokens from '%s': %s", OAUTH2_STORAGE_FILE, e)
+        discard_token_file()
+        return None
+
+def discard_token_file():
+    """Move an unusable token file aside to <file>.bad, keeping the last copy for diagnosis, so new authentication starts clean."""
+    try:
+        os.replace(OAUTH2_STORAGE_FILE, OAUTH2_STORAGE_FILE + ".bad")
+        logger.info("Moved unusable token file to %s.bad", OAUTH2_STORAGE_FILE)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.error("Failed to move unusable token file '%s' aside: %s", OAUTH2_STORAGE_FILE, e)
 
 def save_tokens(credentials):
     """Save OAuth tokens to file."""
@@ -247,37 +414,233 @@ def save_tokens(credentials):
         "scopes": credentials.scopes,
         "expiry": credentials.expiry.isoformat() if credentials.expiry else None
     }
+    data = json_dumps(tokens)
+    try:
+        with open(OAUTH2_STORAGE_FILE, "rb") as f:
+            if f.read() == data:  # Nothing changed, skip the rewrite
+                logger.debug("Stored credentials unchanged, not rewriting %s", OAUTH2_STORAGE_FILE)
+                cache_credentials(credentials)
+                return
+    except OSError:  # No file yet or unreadable, write it below
+        pass
+    tmp_path = None
     try:
-        with open(OAUTH2_STORAGE_FILE, "w") as f:  # Write tokens to file
-            json.dump(tokens, f)
-            logger.info(f"Credentials saved to {OAUTH2_STORAGE_FILE}, expiry={credentials.expiry}")
+        # Write to a temporary file in the same directory and rename it over the old one,
+        # so a crash mid-write never leaves a truncated token file behind
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(OAUTH2_STORAGE_FILE), prefix=".oauth2_", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, OAUTH2_STORAGE_FILE)
+        cache_credentials(credentials)  # Our own write must not invalidate the in-memory copy
+        logger.info("Credentials saved to %s, expiry=%s", OAUTH2_STORAGE_FILE, credentials.expiry)
     except OSError as e:
-        logger.error(f"Failed to save OAuth tokens to '{OAUTH2_STORAGE_FILE}': {e}")
+        logger.error("Failed to save OAuth tokens to '%s': %s", OAUTH2_STORAGE_FILE, e)
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:  # Already renamed or never created
+                pass
         sys.exit(1)  # Exit with non-zero status code
 
-def refresh_token_with_retry(creds):
-    """Attempt to refresh the token with retries."""
-    retry_count = 0
-    while retry_count < MAX_RETRIES:  # Retry up to MAX_RETRIES
+def backoff_delay(prev_sleep):
+    """Return the next retry delay: decorrelated jitter between RETRY_BASE_DELAY and RETRY_MAX_DELAY."""
+    return min(RETRY_MAX_DELAY, random.uniform(RETRY_BASE_DELAY, prev_sleep * 3))
+
+def retry_after_seconds(resp):
+    """Return the delay requested by a Retry-After header (seconds or HTTP date), or None."""
+    value = resp.get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (email.utils.parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def seconds_until(expiry):
+    """Return the seconds left until a naive UTC expiry (as used by google-auth), negative once it has passed."""
+    return (expiry - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds()
+
+@contextlib.contextmanager
+def token_file_lock():
+    """Hold an exclusive lock on a sibling .lock file so concurrent uploaders refresh and save one at a time."""
+    if fcntl is None:
+        yield
+        return
+    with open(OAUTH2_STORAGE_FILE + ".lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)  # Blocks while another process or thread refreshes
         try:
-            creds.refresh(Request())  # Attempt token refresh
-            logger.info(f"Token refresh successful: new expiry={creds.expiry}")
-            save_tokens(creds)  # Save refreshed tokens
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def adopt_stored_token(creds):
+    """
+    Take over a newer access token that another uploader saved while we waited for the lock.
+    Returns True if the stored token was adopted and no refresh is needed.
+    """
+    tokens = load_tokens()
+    if not tokens or tokens.get("refresh_token") != creds.refresh_token:
+        return False
+    expiry = parse_expiry(tokens.get("expiry"))
+    if not expiry or (creds.expiry and expiry <= creds.expiry):
+        return False  # Nothing newer than what we already have
+    if seconds_until(expiry) < TOKEN_STALE_SECONDS:
+        return False  # Newer, but about to expire as well
+    creds.token = tokens["access_token"]
+    creds.expiry = expiry
+    logger.info("Using token refreshed by another process: expiry=%s", creds.expiry)
+    return True
+
+_last_refresh_error = None  # Exception from the last failed refresh attempt, None after a success
+
+def refresh_token_is_rejected():
+    """Return True if the last refresh failed because the refresh token itself was rejected (e.g. revoked), not a transient error."""
+    return isinstance(_last_refresh_error, RefreshError) and not getattr(_last_refresh_error, 'retryable', False)
+
+def refresh_token_with_retry(creds):
+    """Attempt to refresh the token with retries, unless another uploader already did."""
+    global _last_refresh_error
+    with token_file_lock():
+        if adopt_stored_token(creds):  # Single-flight: a concurrent uploader refreshed while we waited
             return True
-        except HttpError as e:
-            logger.error(f"HttpError refreshing token (attempt {retry_count+1}/{MAX_RETRIES}): status={e.resp.status}, content={e.content}")
-        except RefreshError as e:
-            logger.error(f"RefreshError refreshing token (attempt {retry_count+1}/{MAX_RETRIES}): {e}")
-        except urllib.error.URLError as e:
-            logger.error(f"Network error refreshing token (attempt {retry_count+1}/{MAX_RETRIES}): {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error refreshing token (attempt {retry_count+1}/{MAX_RETRIES}): {e}")
-        retry_count += 1
-        sleep_seconds = max(30, (2 ** retry_count)) + random.random()  # Exponential backoff with jitter, minimum 30s
-        logger.info(f"Retrying token refresh in {sleep_seconds:.2f} seconds...")
-        time.sleep(sleep_seconds)
-    logger.error(f"Token refresh failed after {MAX_RETRIES} retries.")
-    return False
+        retry_count = 0
+        attempts = 0  # Refresh calls actually made, for the final message
+        sleep_seconds = RETRY_BASE_DELAY
+        deadline = time.monotonic() + RETRY_DEADLINE_SECONDS if RETRY_DEADLINE_SECONDS > 0 else None
+        while retry_count < MAX_RETRIES:  # Retry up to MAX_RETRIES
+            attempts += 1
+            try:
+                creds.refresh(get_refresh_request())  # Attempt token refresh over pooled connection
+                logger.info("Token refresh successful: new expiry=%s", creds.expiry)
+                save_tokens(creds)  # Save refreshed tokens
+                _last_refresh_error = None
+                return True
+            except HttpError as e:
+                logger.error("HttpError refreshing token (attempt %d/%d): status=%s, content=%s", retry_count + 1, MAX_RETRIES, e.resp.status, e.content)
+                _last_refresh_error = e
+            except RefreshError as e:
+                logger.error("RefreshError refreshing token (attempt %d/%d): %s", retry_count + 1, MAX_RETRIES, e)
+                _last_refresh_error = e
+                if refresh_token_is_rejected():  # e.g. invalid_grant: retrying cannot succeed
+                    break
+            except urllib.error.URLError as e:
+                logger.error("Network error refreshing token (attempt %d/%d): %s", retry_count + 1, MAX_RETRIES, e)
+                _last_refresh_error = e
+            except Exception as e:
+                logger.error("Unexpected error refreshing token (attempt %d/%d): %s", retry_count + 1, MAX_RETRIES, e)
+                _last_refresh_error = e
+            retry_count += 1
+            if retry_count >= MAX_RETRIES:  # No point sleeping after the last attempt
+                break
+            sleep_seconds = backoff_delay(sleep_seconds)
+            if deadline is not None and time.monotonic() + sleep_seconds > deadline:  # Same wall-clock limit as upload retries
+                logger.error("Giving up token refresh: retry_deadline of %.0f seconds reached.", RETRY_DEADLINE_SECONDS)
+                break
+            logger.info("Retrying token refresh in %.2f seconds...", sleep_seconds)
+            time.sleep(sleep_seconds)
+        logger.error("Token refresh failed after %d attempt(s).", attempts)
+        return False
+
+class TokenKeeper:
+    """Keep an access token fresh during long uploads by refreshing it in the background."""
+    def __init__(self, creds):
+        self.creds = creds
+        self.lock = threading.Lock()  # Held while a refresh is in flight
+        self.thread = None
+        self._expiry = None  # creds.expiry that expiry_ts was computed from
+        self.expiry_ts = None  # Expiry as POSIX seconds
+
+    def state(self):
+        """Return 'fresh', 'stale' or 'expired' for the current access token."""
+        if self.creds.expiry is not self._expiry:  # Only convert again after a refresh replaced the expiry
+            self._expiry = self.creds.expiry
+            self.expiry_ts = self._expiry.replace(tzinfo=timezone.utc).timestamp() if self._expiry else None  # Expiry is naive UTC
+        if self.expiry_ts is None:
+            return 'fresh'
+        now_ts = time.time()
+        if now_ts >= self.expiry_ts:
+            return 'expired'
+        if now_ts >= self.expiry_ts - TOKEN_STALE_SECONDS:
+            return 'stale'
+        return 'fresh'
+
+    def _background_refresh(self):
+        """Refresh the token and release the lock, run in a daemon thread."""
+        try:
+            if not refresh_token_with_retry(self.creds):
+                logger.error("Background token refresh failed, upload will continue with the current token.")
+        finally:
+            self.lock.release()
+
+    def ensure_fresh(self):
+        """Start a background refresh if the token is stale; block only if it has already expired."""
+        state = self.state()
+        if state == 'fresh' or not self.creds.refresh_token:
+            return
+        if not self.lock.acquire(blocking=False):  # A refresh is already in flight
+            if state == 'expired':
+                with self.lock:  # Wait for it to finish
+                    pass
+            return
+        if state == 'expired':
+            logger.info("Access token expired, refreshing before continuing upload.")
+            try:
+                refresh_token_with_retry(self.creds)
+            finally:
+                self.lock.release()
+        else:
+            logger.info("Access token close to expiry, refreshing in the background.")
+            self.thread = threading.Thread(target=self._background_refresh, daemon=True)
+            self.thread.start()
+
+_token_keeper = None  # TokenKeeper for the authenticated credentials, set by get_authenticated_service
+_youtube_client = None  # (credentials, service) built by get_authenticated_service, reused while the credentials are unchanged
+
+CREDENTIALS_CACHE_TTL = 55 * 60  # Seconds loaded credentials are reused in-process before reloading from disk
+_credentials_cache = {}  # Cache key -> (Credentials, monotonic time loaded, token file mtime)
+
+def _credentials_cache_key():
+    """Key the credentials cache on a hash of the secrets and token paths, not the paths themselves."""
+    return hashlib.sha256(f"{CLIENT_SECRETS_FILE}\0{OAUTH2_STORAGE_FILE}".encode()).hexdigest()
+
+def _token_file_mtime():
+    """Return the token file's modification time in nanoseconds, or None if it is missing."""
+    try:
+        return os.stat(OAUTH2_STORAGE_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+def get_cached_credentials():
+    """
+    Return in-memory credentials loaded within the TTL and valid for at least TOKEN_STALE_SECONDS more, or None.
+    A changed token file mtime means another process rewrote it, so the cache is bypassed.
+    """
+    entry = _credentials_cache.get(_credentials_cache_key())
+    if entry:
+        creds, loaded_at, mtime = entry
+        if creds.expiry and seconds_until(creds.expiry) < TOKEN_STALE_SECONDS:
+            return None  # About to expire, let the load path refresh it now instead of mid-upload
+        if (time.monotonic() - loaded_at < CREDENTIALS_CACHE_TTL and creds.valid
+                and mtime == _token_file_mtime()):
+            return creds
+    return None
+
+def cache_credentials(creds):
+    """Remember credentials for later calls in the same process."""
+    _credentials_cache[_credentials_cache_key()] = (creds, time.monotonic(), _token_file_mtime())
+
+def parse_expiry(value):
+    """Parse a stored ISO 8601 expiry into the naive UTC datetime google-auth expects."""
+    if not value:
+        return None
+    expiry = datetime.fromisoformat(value)
+    if expiry.tzinfo is not None:
+        expiry = expiry.astimezone(timezone.utc).replace(tzinfo=None)
+    return expiry
 
 def get_authenticated_service(args):
     """
@@ -285,9 +648,18 @@ def get_authenticated_service(args):
     Ensures robust token refresh to avoid manual re-authentication.
     Proactively refreshes tokens before expiry or when invalid.
     Persists credentials after every refresh.
+    Tokens that are still valid are left to the TokenKeeper, which refreshes them
+    in the background during the upload instead of blocking startup.
     """
-    creds = None
-    tokens = load_tokens()  # Load existing tokens
+    global _token_keeper, _youtube_client
+    from google.oauth2.credentials import Credentials  # Manage OAuth credentials
+    creds = None if args.force_refresh else get_cached_credentials()  # Reuse credentials already loaded by this process
+    cache_hit = creds is not None
+    if creds:
+        logger.debug("Using in-memory credentials, skipping token file load.")
+        tokens = None
+    else:
+        tokens = load_tokens()  # Load existing tokens
     if tokens:
         try:
             creds = Credentials(  # Initialize credentials from tokens
@@ -296,115 +668,149 @@ def get_authenticated_service(args):
                 client_id=tokens["client_id"],
                 client_secret=tokens["client_secret"],
                 token_uri=tokens["token_uri"],
-                scopes=tokens["scopes"]
+                scopes=tokens["scopes"],
+                expiry=parse_expiry(tokens.get("expiry"))
             )
-            logger.info(f"Loaded credentials: token={creds.token[:10]}..., expiry={creds.expiry}, refresh_token={creds.refresh_token[:10] if creds.refresh_token else 'None'}...")
 
             # Check token expiry and refresh proactively
-            current_time = datetime.now(timezone.utc)  # Get current UTC time
-            should_refresh = False
             if not creds.refresh_token:  # No refresh token
                 logger.warning("No refresh token available, forcing new authentication.")
                 should_refresh = True
-            elif creds.expiry:
-                expiry_aware = creds.expiry
-                if creds.expiry.tzinfo is None:  # Ensure timezone-aware expiry
-                    expiry_aware = creds.expiry.replace(tzinfo=timezone.utc)
-                time_to_expiry = expiry_aware - current_time
-                logger.info(f"Token expiry: {creds.expiry}, time to expiry: {time_to_expiry}")
-                should_refresh = (
-                    creds.expired or  # Token is expired
-                    time_to_expiry.total_seconds() < 600 or  # Less than 10 minutes remaining
-                    time_to_expiry.total_seconds() <= FORCE_TOKEN_REFRESH_DAYS * 24 * 60 * 60 or  # Within refresh window
-                    args.force_refresh  # Forced refresh via argument
-                )
-            else:
+            elif not creds.expiry:
                 logger.warning("No expiry set in credentials, forcing refresh.")
                 should_refresh = True
+            else:
+                time_to_expiry = seconds_until(creds.expiry)
+                token_age = time.time() - os.path.getmtime(OAUTH2_STORAGE_FILE)  # Seconds since last save
+                should_refresh = (
+                    args.force_refresh or  # Forced refresh via argument
+                    time_to_expiry < 600 or  # Expired or less than 10 minutes remaining
+                    token_age >= FORCE_TOKEN_REFRESH_DAYS * 24 * 60 * 60  # Stored token older than refresh window
+                )
+                if not should_refresh:
+                    logger.debug("Stored token valid for another %d seconds, skipping refresh.", time_to_expiry)
 
             if should_refresh and creds.refresh_token:
                 logger.info("Attempting to refresh token.")
                 success = refresh_token_with_retry(creds)  # Try refreshing token
-                if not success or not creds.valid:
-                    logger.error("Token refresh failed or token still invalid, forcing new authentication.")
-                    os.remove(OAUTH2_STORAGE_FILE) if os.path.exists(OAUTH2_STORAGE_FILE) else None  # Remove invalid token file
+                if success and not creds.valid:
+                    logger.error("Token still invalid after refresh, forcing new authentication.")
+                    discard_token_file()
+                    creds = None
+                elif not success and refresh_token_is_rejected():
+                    logger.error("Refresh token was rejected, forcing new authentication.")
+                    discard_token_file()
                     creds = None
+                elif not success and not creds.valid:  # Network or server trouble: the refresh token is probably fine, keep it for the next run
+                    logger.error("Token refresh failed with transient errors; keeping the token file. Try again later.")
+                    sys.exit(1)  # Exit with non-zero status code
+                elif not success:  # Refreshed early and the current token still works; TokenKeeper tries again during the upload
+                    logger.warning("Token refresh failed with transient errors; continuing with the current token (expiry=%s).", creds.expiry)
         except (ValueError, json.JSONDecodeError) as e:
-            logger.error(f"Invalid or corrupted credentials file ({e}), initiating new authentication.")
-            os.remove(OAUTH2_STORAGE_FILE) if os.path.exists(OAUTH2_STORAGE_FILE) else None  # Remove corrupted file
+            logger.error("Invalid or corrupted credentials file (%s), initiating new authentication.", e)
+            discard_token_file()
             creds = None
         except Exception as e:
-            logger.error(f"Unexpected error loading credentials ({e}), initiating new authentication.")
-            os.remove(OAUTH2_STORAGE_FILE) if os.path.exists(OAUTH2_STORAGE_FILE) else None
+            logger.error("Unexpected error loading credentials (%s), initiating new authentication.", e)
+            discard_token_file()
             creds = None
 
     if not creds or not creds.valid:  # No valid credentials, start new authentication
         logger.info("No valid credentials found, initiating manual authentication for headless system.")
+        from google_auth_oauthlib.flow import InstalledAppFlow  # Only needed for first-time authentication
+        # The PKCE verifier must match the URL the code was issued for, so a URL handed out
+        # by an earlier headless run is completed with that run's verifier
+        verifier_file = OAUTH2_STORAGE_FILE + ".verifier"
+        code_verifier = None
+        try:
+            with open(verifier_file) as f:
+                code_verifier = f.read().strip() or None
+        except FileNotFoundError:  # No pending authorization from an earlier run
+            pass
         flow = InstalledAppFlow.from_client_secrets_file(
-            CLIENT_SECRETS_FILE, SCOPES, redirect_uri="urn:ietf:wg:oauth:2.0:oob"  # Headless OAuth flow
+            CLIENT_SECRETS_FILE, SCOPES, redirect_uri="urn:ietf:wg:oauth:2.0:oob",  # Headless OAuth flow
+            code_verifier=code_verifier
         )
         authorization_url, _ = flow.authorization_url(
             access_type='offline',  # Enable refresh token
             include_granted_scopes='true',
             prompt='select_account'  # Avoid invalidating existing tokens
         )
-        logger.info(f"Please visit this URL to authorize the application: {authorization_url}")
-        print(f"Please visit this URL to authorize the application:\n{authorization_url}")
-        code = input("Enter the authorization code: ").strip()  # Get auth code from user
-        logger.info(f"Authorization code entered: {code}")
+        logger.info("Please visit this URL to authorize the application: %s", authorization_url)
+        if args.auth_code:  # Code obtained beforehand, no prompt needed
+            code = args.auth_code.strip()
+        elif not sys.stdin.isatty():  # Headless run (e.g. cron) would block forever on input()
+            with open(os.open(verifier_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                f.write(flow.code_verifier or "")  # Kept for the --auth-code rerun
+            logger.error("No valid credentials and no terminal to enter the authorization code. Visit the URL above and rerun with --auth-code.")
+            sys.exit(2)
+        else:
+            print(f"Please visit this URL to authorize the application:\n{authorization_url}")
+            code = input("Enter the authorization code: ").strip()  # Get auth code from user
+        logger.info("Authorization code entered.")  # Never log the code itself
 
         try:
             flow.fetch_token(code=code)  # Exchange code for tokens
             creds = flow.credentials
-            logger.info(f"Credentials obtained: token={creds.token[:10]}..., expiry={creds.expiry}, refresh_token={creds.refresh_token[:10] if creds.refresh_token else 'None'}...")
+            logger.info("Credentials obtained: expiry=%s, refresh token %s", creds.expiry, "present" if creds.refresh_token else "missing")
             if not creds.expiry:  # Set default expiry if none provided
                 logger.warning("No expiry set after initial authentication, setting manually.")
-                creds.expiry = datetime.now(timezone.utc) + timedelta(seconds=3600)
+                creds.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=3600)  # Naive UTC like google-auth
             save_tokens(creds)  # Save new credentials
+            try:
+                os.remove(verifier_file)  # Verifier is single-use
+            except FileNotFoundError:
+                pass
         except Exception as e:
-            logger.error(f"Failed to fetch token with code: {e}")
+            logger.error("Failed to fetch token with code: %s", e)
             sys.exit(1)
 
-    # Final validation and refresh
-    if creds and (not creds.valid or creds.expired) and creds.refresh_token:
-        logger.info("Credentials invalid or expired but refresh token available, attempting final refresh.")
-        success = refresh_token_with_retry(creds)
-        if not success:
-            logger.error("Final refresh attempt failed. Please re-authenticate manually.")
-            os.remove(OAUTH2_STORAGE_FILE) if os.path.exists(OAUTH2_STORAGE_FILE) else None
-            sys.exit(1)
+    if not cache_hit:  # Re-caching a hit would restart its TTL on every call
+        cache_credentials(creds)
+    if _token_keeper is None or _token_keeper.creds is not creds:
+        _token_keeper = TokenKeeper(creds)
 
-    return build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, credentials=creds)  # Return authenticated API client
+    if _youtube_client is not None and _youtube_client[0] is creds:
+        return _youtube_client[1]  # Same credentials, the service built for them is still usable
 
-def initialize_upload(youtube, options):
-    """Initialize and execute the upload process for a video to YouTube."""
-    tags = None
-    if options.keywords:  # Split keywords if provided
-        tags = options.keywords.split(",")
-
-    body = dict(  # Construct video metadata
-        snippet=dict(
-            title=options.title,
-            description=options.description,
-            tags=tags,
-            categoryId=options.category,
-            defaultLanguage=options.language,
-            defaultAudioLanguage=options.defaultAudioLanguage if options.defaultAudioLanguage else None,
-            recordingDetails=dict(
-                location=dict(
-                    latitude=float(options.latitude) if options.latitude else None,
-                    longitude=float(options.longitude) if options.longitude else None
-                )
-            ) if options.latitude and options.longitude else None
-        ),
-        status=dict(
-            privacyStatus=options.privacyStatus,
-            selfDeclaredMadeForKids=options.madeForKids,
-            license=options.license,
-            publicStatsViewable=options.publicStatsViewable,
-            publishAt=options.publishAt if options.publishAt else None
-        )
-    )
+    from googleapiclient.discovery import build  # Imported here so --help and config errors return without loading it
+    # API calls made on this thread reuse one keep-alive transport.
+    # static_discovery uses the discovery document bundled with googleapiclient instead of fetching it per run.
+    youtube = build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, http=get_api_http(creds),
+                    static_discovery=True, cache_discovery=False)
+    _youtube_client = (creds, youtube)
+    return youtube  # Return authenticated API client
+
+def build_video_body(options):
+    """Build the videos.insert resource body from the upload options; optional fields are only included when set."""
+    snippet = {
+        "title": options.title,
+        "description": options.description,
+        "categoryId": options.category,
+        "defaultLanguage": options.language,
+    }
+    if options.keywords:  # Already split into a list of tags by parse_keywords()
+        snippet["tags"] = options.keywords
+    if options.defaultAudioLanguage:
+        snippet["defaultAudioLanguage"] = options.defaultAudioLanguage
+
+    status = {
+        "privacyStatus": options.privacyStatus,
+        "selfDeclaredMadeForKids": options.madeForKids,
+        "license": options.license,
+        "publicStatsViewable": options.publicStatsViewable,
+    }
+    if options.publishAt:
+        status["publishAt"] = options.publishAt
+
+    body = {"snippet": snippet, "status": status}
+    if options.latitude is not None and options.longitude is not None:  # recordingDetails is its own resource part, not a snippet field
+        body["recordingDetails"] = {
+            "location": {
+                "latitude": options.latitude,  # 0.0 is a valid coordinate
+                "longitude": options.longitude
+            }
+        }
 
     if options.ageGroup or options.gender or options.geo:  # Add targeting if specified
         body['status']['targeting'] = {}
@@ -414,33 +820,46 @@ def initialize_upload(youtube, options):
             body['status']['targeting']['genders'] = [options.gender]
         if options.geo:
             body['status']['targeting']['countries'] = options.geo.split(',')
+    return body
+
+def initialize_upload(youtube, options):
+    """Upload one video to YouTube. Returns True on success, False after a failure has been logged and notified."""
+    body = build_video_body(options)
+    part = ",".join(body)  # Request exactly the resource parts present in the body
 
     try:
+        media = MmapMediaUpload(options.videofile, chunksize=UPLOAD_CHUNK_SIZE)  # Upload in fixed-size resumable chunks
+        if media.size() <= SIMPLE_UPLOAD_MAX_SIZE:
+            media.set_resumable(False)  # Small file: one multipart request instead of opening an upload session first
         insert_request = youtube.videos().insert(  # Create upload request
-            part=",".join(body.keys()),
+            part=part,
             body=body,
-            media_body=MediaFileUpload(options.videofile, chunksize=-1, resumable=True)  # Enable resumable upload
+            media_body=media
         )
 
         response = resumable_upload(insert_request, enable_pause=options.enable_pause)  # Perform upload
+        media.close()
         if response is None:  # Check if upload failed
             logger.error("Upload failed after retries.")
             # Send failure notification email
             failure_message = f"Video upload failed: {options.title}\n\nThe upload failed after maximum retries. Please check the logs for more details."
             send_email("Upload Failed", failure_message, getattr(options, 'email', None))
-            sys.exit(1)  # Exit with non-zero status code
+            return False
 
         # Send success notification email
         video_id = response.get('id', 'Unknown')
         video_url = f"https://www.youtube.com/watch?v={video_id}" if video_id != 'Unknown' else "N/A"
         success_message = f"Video uploaded successfully!\n\nTitle: {options.title}\nVideo ID: {video_id}\nVideo URL: {video_url}\nDescription: {options.description}\nPrivacy Status: {options.privacyStatus}"
-        send_email("Upload Successful", success_message, getattr(options, 'email', None))
 
+        # The success email, thumbnail and playlist calls are independent of each other and of the next upload,
+        # so they run in the background; main() waits for them via wait_for_post_upload_tasks().
+        # thumbnails.set carries a media body and cannot go into a batch request.
+        submit_post_upload_task(send_email, "Upload Successful", success_message, getattr(options, 'email', None))
         if options.thumbnail:  # Upload thumbnail if provided
-            upload_thumbnail(youtube, response['id'], options.thumbnail)
-
+            submit_post_upload_task(upload_thumbnail, youtube, response['id'], options.thumbnail)
         if options.playlistId:  # Add to playlist if specified
-            add_video_to_playlist(youtube, response['id'], options.playlistId)
+            submit_post_upload_task(add_video_to_playlist, youtube, response['id'], options.playlistId)
+        return True
 
     except HttpError as e:  # Handle critical HTTP errors (e.g., 400 uploadLimitExceeded)
         logger.error(f"Critical HTTP error during upload: status={e.resp.status}, content={e.content}")
@@ -448,14 +867,43 @@ def initialize_upload(youtube, options):
         error_summary = f"HTTP {e.resp.status}" if hasattr(e, 'resp') else "HTTP Error"
         failure_message = f"Video upload failed with HTTP error: {options.title}\n\nError: {error_summary}\n\nPlease check the logs for more details."
         send_email("Upload Failed - HTTP Error", failure_message, getattr(options, 'email', None))
-        sys.exit(1)  # Exit with non-zero status code
+        return False
     except Exception as e:  # Handle other unexpected errors
         logger.error(f"Unexpected error during upload: {e}")
         # Send failure notification email (sanitize error details)
         error_type = type(e).__name__
         failure_message = f"Video upload failed with unexpected error: {options.title}\n\nError Type: {error_type}\n\nPlease check the logs for more details."
         send_email("Upload Failed - Unexpected Error", failure_message, getattr(options, 'email', None))
-        sys.exit(1)  # Exit with non-zero status code
+        return False
+
+_post_upload_executor = None
+_post_upload_futures = []
+_post_upload_lock = threading.Lock()
+
+def submit_post_upload_task(fn, *args):
+    """Run a post-upload call in the background, so the next upload does not wait for it."""
+    global _post_upload_executor
+    with _post_upload_lock:
+        if _post_upload_executor is None:
+            _post_upload_executor = ThreadPoolExecutor(max_workers=POST_UPLOAD_WORKERS)
+        _post_upload_futures.append(_post_upload_executor.submit(fn, *args))
+
+def wait_for_post_upload_tasks():
+    """Wait for all background post-upload calls and return how many of them failed."""
+    with _post_upload_lock:
+        futures = list(_post_upload_futures)
+        _post_upload_futures.clear()
+    failures = 0
+    for future in futures:
+        try:
+            future.result()
+        except HttpError as e:
+            logger.error("Post-upload API call failed: status=%s, content=%s", e.resp.status, e.content)
+            failures += 1
+        except Exception as e:
+            logger.error("Post-upload task failed: %s", e)
+            failures += 1
+    return failures
 
 def add_video_to_playlist(youtube, video_id, playlist_id):
     """Add the uploaded video to a specified playlist."""
@@ -471,7 +919,7 @@ def add_video_to_playlist(youtube, video_id, playlist_id):
             }
         }
     )
-    response = add_video_request.execute()  # Execute playlist addition
+    response = execute_request(add_video_request)  # Execute playlist addition
     logger.info(f"Video {video_id} added to playlist {playlist_id}")
 
 def upload_thumbnail(youtube, video_id, thumbnail_path):
@@ -481,11 +929,96 @@ def upload_thumbnail(youtube, video_id, thumbnail_path):
             videoId=video_id,
             media_body=MediaFileUpload(thumbnail_path)  # Upload thumbnail file
         )
-        response = request.execute()
+        response = execute_request(request)
         logger.info(f"Thumbnail uploaded for video {video_id}: {response}")
     except HttpError as e:
         logger.error(f"An error occurred while uploading the thumbnail: {e}")
 
+class MmapMediaUpload(MediaUpload):
+    """
+    Resumable media upload that serves chunks straight from a memory-mapped video file.
+    Files that cannot be mapped (empty files, pipes, some network filesystems) are read through a large buffer instead.
+    """
+    def __init__(self, filename, chunksize, mimetype=None, resumable=True):
+        self._filename = filename
+        self._fd = open(filename, 'rb', buffering=READ_BUFFER_SIZE)
+        self._size = os.fstat(self._fd.fileno()).st_size
+        try:
+            self._mm = mmap.mmap(self._fd.fileno(), 0, access=mmap.ACCESS_READ)  # Pages are read from the page cache on demand
+            self._view = memoryview(self._mm)
+        except (ValueError, OSError) as e:
+            logger.debug("Cannot memory-map %s (%s), using buffered reads.", filename, e)
+            self._mm = None
+            self._view = None
+        self._mimetype = mimetype or mimetypes.guess_type(filename)[0] or 'video/*'  # YouTube accepts video/* for unknown extensions
+        self._chunksize = chunksize
+        self._resumable = resumable
+
+    def chunksize(self):
+        return self._chunksize
+
+    def mimetype(self):
+        return self._mimetype
+
+    def size(self):
+        return self._size
+
+    def resumable(self):
+        return self._resumable
+
+    def set_resumable(self, resumable):
+        """Choose between a resumable session and a single multipart request; call before building the insert request."""
+        self._resumable = resumable
+
+    def getbytes(self, begin, length):
+        """
+        Return the requested byte range as a memoryview of the mapping.
+        http.client sends buffer objects as-is, so chunk bytes are never copied into a Python bytes object.
+        """
+        if self._view is None:
+            self._fd.seek(begin)
+            chunk = self._fd.read(length)
+        elif self._resumable:
+            chunk = self._view[begin:begin + length]
+            self._prefetch(begin + length, length)  # Read the next chunk from disk while this one is on the network
+        else:
+            chunk = bytes(self._view[begin:begin + length])  # The multipart body is assembled from bytes, and the file is small
+        if logger.isEnabledFor(logging.DEBUG):  # Hashing costs a pass over the chunk, so only when it is logged
+            logger.debug("Sending bytes %d-%d, sha256=%s", begin, begin + len(chunk) - 1, hashlib.sha256(chunk).hexdigest())
+        return chunk
+
+    def _prefetch(self, begin, length):
+        """Ask the kernel to start reading a byte range of the mapping in the background (Linux/BSD; no-op elsewhere)."""
+        if not hasattr(mmap, 'MADV_WILLNEED') or begin >= self._size:
+            return
+        start = begin - begin % mmap.PAGESIZE  # madvise() needs a page-aligned start
+        try:
+            self._mm.madvise(mmap.MADV_WILLNEED, start, min(begin + length, self._size) - start)
+        except OSError as e:  # Advice only, the upload works without it
+            logger.debug("madvise failed: %s", e)
+
+    def has_stream(self):
+        return False  # Make googleapiclient use getbytes() for every chunk
+
+    def close(self):
+        """Unmap and close the video file."""
+        if self._view is not None:
+            self._view.release()
+        if self._mm is not None and not self._mm.closed:
+            try:
+                self._mm.close()
+            except BufferError:  # A chunk view is still referenced, the mapping is released with it
+                pass
+        if not self._fd.closed:
+            self._fd.close()
+
+    def __del__(self):
+        if hasattr(self, '_view'):
+            self.close()
+
+    def to_json(self):
+        return self._to_json(strip=['_fd', '_mm', '_view'])
+
 class KeyboardInputHandler:
     """Handle non-blocking keyboard input for pause/resume functionality."""
     def __init__(self):
@@ -525,10 +1058,17 @@ class KeyboardInputHandler:
             return None
 
 def resumable_upload(insert_request, enable_pause=False):
-    """Implement resumable upload with exponential backoff strategy and optional pause/resume."""
+    """Send the upload with exponential backoff and optional pause/resume; small non-resumable uploads go out in one request."""
     response = None
     error = None
     retry = 0
+    rate_limited = 0  # 429 responses, counted separately so throttling does not use up the retries for server errors
+    sleep_seconds = RETRY_BASE_DELAY  # Previous backoff delay, for decorrelated jitter
+    retry_after = None  # Delay requested by the server for the last error
+    throttled = False
+    deadline = None  # Monotonic time after which retrying stops, set by the first error since the last accepted chunk
+    progress_step = -1  # Last 5% step reported at INFO level
+    started = time.monotonic()  # For the average throughput and ETA in progress lines
     
     # Initialize keyboard input handler if pause is enabled
     keyboard_handler = None
@@ -559,52 +1099,118 @@ def resumable_upload(insert_request, enable_pause=False):
                 time.sleep(0.5)
                 continue
             
-            logger.info("Uploading file...")
-            status, response = insert_request.next_chunk()  # Upload next chunk
+            if _token_keeper:
+                _token_keeper.ensure_fresh()  # Refresh in the background before the token runs out mid-upload
+
+            logger.debug("Uploading file...")
+            # Upload next chunk, resumes from last acknowledged byte; uses this thread's transport so batch uploads can run in parallel
+            http = get_api_http(insert_request.http.credentials)
+            media = insert_request.resumable
+            if media is None:  # Small file sent as one multipart request; a retry re-sends all of it
+                status, response = None, insert_request.execute(http=http)
+            else:
+                sent_end = min(insert_request.resumable_progress + media.chunksize(), media.size())  # Offset the server should acknowledge
+                status, response = insert_request.next_chunk(http=http)
+            if status is not None:  # Chunk accepted, more to send
+                retry = 0  # Progress was made, a later error starts with a fresh retry budget
+                rate_limited = 0
+                sleep_seconds = RETRY_BASE_DELAY
+                deadline = None  # And a new retry window
+                if status.resumable_progress < sent_end:  # Server stored less than was sent, e.g. a proxy cut the body short
+                    logger.warning("Server acknowledged %d of %d bytes sent, resending from there.", status.resumable_progress, sent_end)
+                step = int(status.progress() * 20)  # Report at INFO once per 5%, other chunks only at DEBUG
+                rate = status.resumable_progress / max(time.monotonic() - started, 1e-6)  # Average bytes per second, including retry waits
+                logger.log(logging.INFO if step > progress_step else logging.DEBUG,
+                           "Upload progress: %d%% (%d/%d bytes, %.1f MiB/s, about %d s left)",
+                           status.progress() * 100, status.resumable_progress, status.total_size,
+                           rate / (1024 * 1024), (status.total_size - status.resumable_progress) / rate if rate else 0)
+                progress_step = max(progress_step, step)
             if response is not None:
                 if 'id' in response:  # Check if upload succeeded
-                    logger.info(f"Video id '{response['id']}' was successfully uploaded.")
+                    logger.info("Video id '%s' was successfully uploaded.", response['id'])
                     if keyboard_handler:
                         keyboard_handler.stop()
                     return response
-                else:
+                elif media is not None:
+                    # Ask the session for its final state on the next attempt instead of sending more data
+                    insert_request._in_error_state = True
+                    incomplete, response = response, None  # Keep the loop going
+                    raise IncompleteResponseError(f"The upload finished with an unexpected response: {incomplete}")
+                else:  # Re-sending a multipart request could create a second video
                     raise Exception(f"The upload failed with an unexpected response: {response}")
         except HttpError as e:
             if e.resp.status in RETRIABLE_STATUS_CODES:  # Retry on specific HTTP errors
                 error = f"A retriable HTTP error {e.resp.status} occurred:\n{e.content}"
+                retry_after = retry_after_seconds(e.resp)
+            elif e.resp.status in RATE_LIMIT_STATUS_CODES:
+                error = f"Rate limited with HTTP {e.resp.status}:\n{e.content}"
+                throttled = True
+                retry_after = retry_after_seconds(e.resp)
             else:
-                logger.error(f"Non-retriable HTTP error {e.resp.status} occurred: {e.content}")
+                logger.error("Non-retriable HTTP error %s occurred: %s", e.resp.status, e.content)
                 if keyboard_handler:
                     keyboard_handler.stop()
                 raise  # Raise non-retriable errors (e.g., 400)
+        except (RefreshError, TransportError) as e:  # AuthorizedHttp refreshes inline on 401; that refresh itself failed
+            if isinstance(e, RefreshError) and not getattr(e, 'retryable', False):  # e.g. invalid_grant: retrying cannot succeed
+                logger.error("Refresh token was rejected during upload: %s", e)
+                if keyboard_handler:
+                    keyboard_handler.stop()
+                raise
+            error = f"Token refresh during upload failed: {e}"
         except RETRIABLE_EXCEPTIONS as e:  # Retry on specific exceptions
             error = f"A retriable error occurred: {e}"
 
         if error is not None:
             logger.error(error)
-            retry += 1
-            if retry > MAX_RETRIES:  # Return None if max retries exceeded
-                logger.error(f"Upload failed after {MAX_RETRIES} retries.")
+            if throttled:
+                rate_limited += 1
+                attempt = rate_limited
+            else:
+                retry += 1
+                attempt = retry
+            if attempt > MAX_RETRIES:  # Return None if max retries exceeded
+                logger.error("Upload failed after %d retries.", MAX_RETRIES)
                 if keyboard_handler:
                     keyboard_handler.stop()
                 return None
-            sleep_seconds = max(30, (2 ** retry)) + random.random()  # Exponential backoff with jitter, minimum 30s
-            logger.info(f"Retrying upload (attempt {retry}/{MAX_RETRIES}) in {sleep_seconds:.2f} seconds...")
-            time.sleep(sleep_seconds)
+            sleep_seconds = backoff_delay(sleep_seconds)
+            delay = retry_after if retry_after is not None else sleep_seconds  # Server-requested delay takes precedence
+            if RETRY_DEADLINE_SECONDS > 0:
+                if deadline is None:
+                    deadline = time.monotonic() + RETRY_DEADLINE_SECONDS
+                if time.monotonic() + delay > deadline:  # Waiting would overrun the retry deadline
+                    logger.error("Upload failed: still failing after retrying for %.0f seconds.", RETRY_DEADLINE_SECONDS)
+                    if keyboard_handler:
+                        keyboard_handler.stop()
+                    return None
+            if insert_request.resumable is not None:  # Only the unacknowledged tail is sent again
+                logger.info("Retrying upload (attempt %d/%d) in %.2f seconds, resuming at byte %d of %d...",
+                            attempt, MAX_RETRIES, delay, insert_request.resumable_progress, insert_request.resumable.size())
+            else:
+                logger.info("Retrying upload (attempt %d/%d) in %.2f seconds...", attempt, MAX_RETRIES, delay)
+            time.sleep(delay)
+            error = None
+            throttled = False
+            retry_after = None
 
     if keyboard_handler:
         keyboard_handler.stop()
     return None
 
-if __name__ == '__main__':
-    import argparse
+def parse_keywords(value):
+    """Split a comma separated keyword string into a list of tags, dropping empty entries."""
+    return [tag.strip() for tag in value.split(",") if tag.strip()]
 
+@functools.lru_cache(maxsize=1)
+def build_parser():
+    """Build the command line argument parser once; parse_args() does not modify it, so repeated calls share it."""
     parser = argparse.ArgumentParser()  # Initialize argument parser
     parser.add_argument("--videofile", help="Video file to upload")
     parser.add_argument("--title", help="Video title", default="Test Title")
     parser.add_argument("--description", help="Video description", default="Test Description")
     parser.add_argument("--category", default="22", help="Numeric video category.")
-    parser.add_argument("--keywords", help="Video keywords, comma separated", default="")
+    parser.add_argument("--keywords", help="Video keywords, comma separated", type=parse_keywords, default=[])
     parser.add_argument("--privacyStatus", choices=["public", "private", "unlisted"], default="public", help="Video privacy status.")
     parser.add_argument("--latitude", help="Latitude of the video location", type=float)
     parser.add_argument("--longitude", help="Longitude of the video location", type=float)
@@ -621,28 +1227,92 @@ if __name__ == '__main__':
     parser.add_argument("--defaultAudioLanguage", help="Default audio language for the video")
     parser.add_argument("--enable-pause", action="store_true", help="Enable interactive pause/resume during upload", default=False)
     parser.add_argument("--email", help="Override recipient email address for notifications (optional)")
+    parser.add_argument("--batch", help="JSON file with a list of videos to upload in one run; each entry sets per-video options such as videofile and title")
     
     auth_group = parser.add_argument_group('Authentication or debugging related options')
     auth_group.add_argument("--no-upload", action="store_true", help="Only authenticate, do not upload the video")
     auth_group.add_argument("--force-refresh", action="store_true", help="Force token refresh for debugging")
+    auth_group.add_argument("--auth-code", help="Authorization code from the printed URL, for authenticating without an interactive prompt")
+    return parser
+
+def load_batch(path, args):
+    """
+    Read a batch file: a JSON list of objects whose keys are option names (e.g. videofile, title, privacyStatus).
+    Each entry starts from the command line options, so shared settings only need to be given once.
+    """
+    with open(path, "r") as f:
+        entries = json.load(f)
+    if not isinstance(entries, list):
+        raise ValueError("batch file must contain a JSON list")
+    batch = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"entry {index}: must be a JSON object")
+        options = argparse.Namespace(**vars(args))  # Copy command line defaults
+        for key, value in entry.items():
+            if not hasattr(options, key):
+                raise ValueError(f"entry {index}: unknown option '{key}'")
+            setattr(options, key, value)
+        if isinstance(options.keywords, str):  # Entries may give keywords as a string or as a list
+            options.keywords = parse_keywords(options.keywords)
+        if not options.videofile:
+            raise ValueError(f"entry {index}: missing 'videofile'")
+        batch.append(options)
+    return batch
 
-    args = parser.parse_args()  # Parse command-line arguments
+def main(argv=None):
+    """Command line entry point: authenticate once, then upload one video or a whole batch. argv defaults to sys.argv[1:]."""
+    args = build_parser().parse_args(argv)  # Parse command-line arguments
+    load_config()  # Read config.cfg and set up logging
 
-    if not args.no_upload and not args.videofile:  # Check for required video file
-        logger.error("Please specify a valid file using the --videofile= parameter if not using --no-upload.")
+    if not args.no_upload and not args.videofile and not args.batch:  # Check for required video file
+        logger.error("Please specify a valid file using the --videofile= parameter (or --batch) if not using --no-upload.")
         sys.exit(1)  # Exit with non-zero status code
 
+    videos = [args]
+    if args.batch and not args.no_upload:
+        try:
+            videos = load_batch(args.batch, args)
+        except (OSError, ValueError) as e:  # json.JSONDecodeError is a ValueError
+            logger.error(f"Invalid batch file '{args.batch}': {e}")
+            sys.exit(1)  # Exit with non-zero status code
+
+    if not args.no_upload:
+        unusable = find_unusable_inputs(videos)  # Before authentication, so a typo does not cost an OAuth round-trip
+        if unusable:
+            logger.error("Cannot use input file(s): %s", ", ".join(unusable))
+            sys.exit(1)  # Exit with non-zero status code
+
     check_files()  # Verify required files and directories
 
-    youtube = get_authenticated_service(args)  # Get authenticated API client
+    youtube = get_authenticated_service(args)  # Authenticate once for all videos
     try:
-        if not args.no_upload:  # Perform upload if not in no-upload mode
-            initialize_upload(youtube, args)
-        else:
+        if args.no_upload:
             logger.info("Authentication completed. No video uploaded.")
+            return
+        workers = min(MAX_CONCURRENT_UPLOADS, len(videos))
+        if any(options.enable_pause for options in videos):
+            workers = 1  # Pause/resume reads the keyboard, which only works for one upload at a time
+        if workers > 1:
+            # Uploads spend their time waiting on the network, so threads overlap them; each thread has its own transport
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(lambda options: initialize_upload(youtube, options), videos))
+        else:
+            results = [initialize_upload(youtube, options) for options in videos]
+        failures = results.count(False)
+        task_failures = wait_for_post_upload_tasks()  # Thumbnails, playlist entries and emails still in flight
+        if failures:
+            logger.error("%d of %d upload(s) failed.", failures, len(videos))
+        if task_failures:
+            logger.error("%d thumbnail, playlist or email task(s) failed.", task_failures)
+        if failures or task_failures:
+            sys.exit(1)  # Exit with non-zero status code
     except HttpError as e:  # Handle critical HTTP errors during upload
         logger.error(f"An HTTP error {e.resp.status} occurred: {e.content}")
         sys.exit(1)  # Exit with non-zero status code
     except Exception as e:  # Handle other unexpected errors
         logger.error(f"Unexpected error: {e}")
         sys.exit(1)  # Exit with non-zero status code
+
+if __name__ == '__main__':
+    main()